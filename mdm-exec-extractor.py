@@ -23,20 +23,70 @@ Key points
   it inherits from the closest parent DFProperties (no fabrication).
 """
 
+from __future__ import annotations
+
+import concurrent.futures
+import functools
 import io
 import json
+import os
+import random
 import re
+import shutil
+import sys
+import tempfile
 import uuid
 import zipfile
+import urllib.error
 import urllib.request
-import xml.etree.ElementTree as ET
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, BinaryIO
+
+# lxml's C parser is roughly an order of magnitude faster than the pure-Python
+# ElementTree walk on the ~100-file DDF bundle. It stays optional so the script
+# keeps working on a bare stdlib install.
+try:
+    from lxml import etree as ET
+    _HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAVE_LXML = False
+
+# Same deal for output serialization: orjson writes the result as bytes in
+# one native call, but stdlib json is always there.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _iterparse(source: BinaryIO):
+    """iterparse with start+end events, parser differences papered over.
+
+    lxml takes parser options as keywords (and yields comment nodes unless
+    told not to); stdlib ElementTree omits comments by default.
+    """
+    if _HAVE_LXML:
+        # Hardening in the spirit of defusedxml without the dependency: the
+        # bundle comes off the network, so never expand entities or touch
+        # the network at parse time. collect_ids=False skips building the
+        # XML ID hash, which nothing here looks up.
+        return ET.iterparse(
+            source,
+            events=("start", "end"),
+            remove_comments=True,
+            resolve_entities=False,
+            no_network=True,
+            collect_ids=False,
+        )
+    # stdlib ElementTree already refuses to expand external entities.
+    return ET.iterparse(source, events=("start", "end"))
 
 # --------------------------------------------------------------------
 # Config
 # --------------------------------------------------------------------
 LEARN_CSP_DDF_URL = "https://learn.microsoft.com/en-us/windows/client-management/mdm/configuration-service-provider-ddf"
 OUTPUT_FILE = "csp_exec_commands.json"
+DDF_CACHE_FILE = "ddf_bundle.zip"
+DDF_CACHE_META = "ddf_bundle.meta.json"
 ZIP_LINK_RE = re.compile(r'href="(https://download\.microsoft\.com/[^"]+\.zip)"', re.IGNORECASE)
 
 # --------------------------------------------------------------------
@@ -61,6 +111,99 @@ def download(url: str, retries: int = 3) -> bytes:
                 raise
     return b""
 
+def download_to_file(
+    url: str, retries: int = 3, headers: Optional[Dict[str, str]] = None
+) -> Tuple[BinaryIO, Dict[str, str]]:
+    """Stream a download into a spooled temp file; retries a few times.
+
+    Used for the DDF ZIP so the archive is copied in 64 KiB chunks instead
+    of being held as one large bytes object; small responses stay in memory
+    and big ones spill to disk transparently.
+
+    Returns (file, validators) where validators holds any ETag/Last-Modified
+    the server sent, for conditional re-fetches later. Extra request
+    `headers` are merged over the defaults; an HTTP 304 propagates to the
+    caller immediately instead of being retried.
+    """
+    req_headers = {"User-Agent": "mdm-exec-builder/1.0"}
+    if headers:
+        req_headers.update(headers)
+
+    for attempt in range(1, retries + 1):
+        tmp = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+        try:
+            req = urllib.request.Request(url, headers=req_headers)
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                shutil.copyfileobj(resp, tmp, length=64 * 1024)
+                validators = {}
+                if resp.headers.get("ETag"):
+                    validators["etag"] = resp.headers["ETag"]
+                if resp.headers.get("Last-Modified"):
+                    validators["last_modified"] = resp.headers["Last-Modified"]
+            tmp.seek(0)
+            return tmp, validators
+        except Exception as e:
+            tmp.close()
+            if isinstance(e, urllib.error.HTTPError) and e.code == 304:
+                raise  # "not modified" is an answer, not a failure
+            log(f"Download failed (attempt {attempt}/{retries}): {e}")
+            if attempt == retries:
+                raise
+    raise RuntimeError("unreachable")
+
+def _load_cache_meta() -> Dict:
+    """Sidecar metadata for the cached bundle ({} if absent or unreadable)."""
+    try:
+        with open(DDF_CACHE_META, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def fetch_ddf_zip(url: str) -> BinaryIO:
+    """Return an open binary file for the DDF ZIP, using a local cache.
+
+    The bundle is kept in DDF_CACHE_FILE with its source URL and any HTTP
+    validators recorded in a sidecar. When the URL matches and validators
+    exist, the cached copy is revalidated with a conditional GET — a 304
+    costs one header round-trip instead of the full download. Without
+    validators the URL key alone is trusted, since Microsoft publishes
+    each new bundle under a fresh download URL.
+    """
+    meta = _load_cache_meta()
+    have_cache = meta.get("url") == url and os.path.exists(DDF_CACHE_FILE)
+
+    cond_headers: Dict[str, str] = {}
+    if have_cache:
+        if meta.get("etag"):
+            cond_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            cond_headers["If-Modified-Since"] = meta["last_modified"]
+        if not cond_headers:
+            log(f"Using cached bundle: {DDF_CACHE_FILE}")
+            return open(DDF_CACHE_FILE, "rb")
+        log("Revalidating cached bundle…")
+    else:
+        log(f"Downloading: {url}")
+
+    try:
+        tmp, validators = download_to_file(url, headers=cond_headers or None)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and have_cache:
+            log(f"Bundle unchanged on server; using cached {DDF_CACHE_FILE}")
+            return open(DDF_CACHE_FILE, "rb")
+        raise
+
+    try:
+        with open(DDF_CACHE_FILE, "wb") as f:
+            shutil.copyfileobj(tmp, f)
+        with open(DDF_CACHE_META, "w", encoding="utf-8") as f:
+            json.dump({"url": url, **validators}, f)
+    except OSError as e:
+        # Caching is best-effort; the download itself already succeeded.
+        log(f"Could not cache bundle locally: {e}")
+    tmp.seek(0)
+    return tmp
+
 def find_latest_ddf_zip_url() -> str:
     """Scrape the Learn page to find the first Microsoft download ZIP link."""
     html = download(LEARN_CSP_DDF_URL).decode("utf-8", errors="ignore")
@@ -72,9 +215,38 @@ def find_latest_ddf_zip_url() -> str:
 # --------------------------------------------------------------------
 # XML helpers
 # --------------------------------------------------------------------
+@functools.lru_cache(maxsize=256)
 def lname(tag: str) -> str:
-    """Return local (namespace-stripped) lowercase tag name."""
-    return tag.split("}", 1)[-1].lower()
+    """Return local (namespace-stripped) lowercase tag name.
+
+    DDF files reuse a tiny tag vocabulary across tens of thousands of
+    elements, so the split+lower is memoized instead of recomputed.
+    """
+    return tag.rpartition("}")[2].lower()
+
+def child_map(elem: ET.Element) -> Dict[str, ET.Element]:
+    """Map local name -> first direct child, built in a single pass.
+
+    Replaces repeated first_child() scans when several children of the
+    same element are needed (the common case in the tree walk).
+    """
+    kids: Dict[str, ET.Element] = {}
+    for child in elem:
+        ln = lname(child.tag)
+        if ln not in kids:
+            kids[ln] = child
+    return kids
+
+def clean_text(text: str) -> str:
+    """Collapse runs of whitespace (DDF descriptions wrap freely) to single spaces."""
+    return " ".join(text.split())
+
+def elem_text(elem: Optional[ET.Element]) -> Optional[str]:
+    """Stripped text content of an element, or None."""
+    if elem is None:
+        return None
+    txt = (elem.text or "").strip()
+    return txt or None
 
 def first_child(elem: ET.Element, localname: str) -> Optional[ET.Element]:
     """First direct child with the given local name (case-insensitive)."""
@@ -86,38 +258,32 @@ def first_child(elem: ET.Element, localname: str) -> Optional[ET.Element]:
 
 def first_child_text(elem: ET.Element, localname: str) -> Optional[str]:
     """Stripped text content of first direct child with given name, or None."""
-    c = first_child(elem, localname)
-    if c is None:
-        return None
-    txt = (c.text or "").strip()
-    return txt or None
+    return elem_text(first_child(elem, localname))
 
-def has_exec_access(dfprops: ET.Element) -> bool:
-    """True if DFProperties/AccessType contains an <Exec/> element."""
-    access = first_child(dfprops, "AccessType")
-    if access is None:
-        return False
-    for op in access:
-        if lname(op.tag) == "exec":
-            return True
-    return False
-
-def df_format(dfprops: ET.Element) -> Optional[str]:
+def dfprops_info(dfprops: ET.Element) -> Tuple[bool, Optional[str], Optional[str]]:
     """
-    DFFormat is usually:
-      <DFFormat><chr/></DFFormat>
-    or sometimes text content.
+    Return (has Exec access, declared format, default value) for a
+    DFProperties element in a single pass over its children.
+
+    AccessType must contain an <Exec/> element; DFFormat is usually
+    <DFFormat><chr/></DFFormat> but is sometimes text content.
     """
-    df = first_child(dfprops, "DFFormat")
-    if df is None:
-        return None
-    for child in df:
-        return lname(child.tag)
-    txt = (df.text or "").strip()
-    return txt.lower() if txt else None
+    kids = child_map(dfprops)
+
+    access = kids.get("accesstype")
+    has_exec = access is not None and any(lname(op.tag) == "exec" for op in access)
+
+    fmt: Optional[str] = None
+    df = kids.get("dfformat")
+    if df is not None:
+        for child in df:
+            fmt = lname(child.tag)
+            break
+        else:
+            txt = (df.text or "").strip()
+            fmt = txt.lower() if txt else None
 
-def default_value(dfprops: ET.Element) -> Optional[str]:
-    return first_child_text(dfprops, "DefaultValue")
+    return has_exec, fmt, elem_text(kids.get("defaultvalue"))
 
 def join_uri(prefix: str, name: str) -> str:
     """Join DDF Path + NodeName into a full OMA_URI."""
@@ -130,15 +296,31 @@ def join_uri(prefix: str, name: str) -> str:
 # --------------------------------------------------------------------
 # Inheritance helpers (walk DFProperties chain)
 # --------------------------------------------------------------------
-def inherited_text_from_chain(dfprops_chain: List[ET.Element], child_name: str) -> Optional[str]:
+def inherited_text_from_chain(
+    dfprops_chain: List[ET.Element],
+    child_name: str,
+    cache: Optional[Dict] = None,
+) -> Optional[str]:
     """
     Iterate DFProperties from current -> parent -> ... and return first non-empty text
     for the given child tag (e.g., 'Description').
+
+    `cache` maps DFProperties element -> normalized text (or None). Chains of
+    sibling nodes share their ancestors, so with a cache each DFProperties is
+    scanned and whitespace-normalized once per file instead of once per record.
+    The cache must be dedicated to a single child_name.
     """
     for dfp in dfprops_chain:
-        val = first_child_text(dfp, child_name)
+        if cache is not None and dfp in cache:
+            val = cache[dfp]
+        else:
+            val = first_child_text(dfp, child_name)
+            if val:
+                val = clean_text(val)
+            if cache is not None:
+                cache[dfp] = val
         if val:
-            return " ".join(val.split())
+            return val
     return None
 
 def inherited_osbuild_from_chain(dfprops_chain: List[ET.Element]) -> Optional[str]:
@@ -154,6 +336,14 @@ def inherited_osbuild_from_chain(dfprops_chain: List[ET.Element]) -> Optional[st
 # --------------------------------------------------------------------
 # Exec payload builder
 # --------------------------------------------------------------------
+# CmdID is a SyncML correlation id, not a secret: a process-local PRNG
+# (seeded from the OS once) avoids uuid4()'s os.urandom read per call.
+_CMDID_RNG = random.Random()
+
+def new_cmd_id() -> uuid.UUID:
+    """Fresh random UUID for <CmdID>; RFC 4122 v4 layout, non-cryptographic."""
+    return uuid.UUID(int=_CMDID_RNG.getrandbits(128), version=4)
+
 def must_emit_data(eff_fmt: str, default_val: Optional[str]) -> bool:
     """
     Emit <Data> when:
@@ -169,9 +359,16 @@ def must_emit_data(eff_fmt: str, default_val: Optional[str]) -> bool:
 
 def build_exec_lines(uri: str, fmt: Optional[str], default_val: Optional[str]) -> List[str]:
     eff_fmt = (fmt or "chr").lower()
-    lines: List[str] = [
+    if not must_emit_data(eff_fmt, default_val):
+        data_lines: List[str] = []
+    elif default_val is not None and eff_fmt != "null":
+        data_lines = [f"    <Data>{default_val}</Data>"]
+    else:
+        data_lines = ["    <Data></Data>"]
+    # Built in one go; the optional <Data> line splices in via unpacking.
+    return [
         "<Exec>",
-        f"  <CmdID>{uuid.uuid4()}</CmdID>",
+        f"  <CmdID>{new_cmd_id()}</CmdID>",
         "  <Item>",
         "    <Target>",
         f"      <LocURI>{uri.strip()}</LocURI>",
@@ -180,97 +377,177 @@ def build_exec_lines(uri: str, fmt: Optional[str], default_val: Optional[str]) -
         f'      <Format xmlns="syncml:metinf">{eff_fmt}</Format>',
         "      <Type>text/plain</Type>",
         "    </Meta>",
+        *data_lines,
+        "  </Item>",
+        "</Exec>",
     ]
-    if must_emit_data(eff_fmt, default_val):
-        if default_val is not None and eff_fmt != "null":
-            lines.append(f"    <Data>{default_val}</Data>")
-        else:
-            lines.append("    <Data></Data>")
-    lines += ["  </Item>", "</Exec>"]
-    return lines
 
 # --------------------------------------------------------------------
 # DDF ZIP parsing (with inheritance)
 # --------------------------------------------------------------------
-def discover_exec_entries_from_zip(zip_bytes: bytes) -> List[Dict]:
+def _extract_from_xml(item: Tuple[str, bytes]) -> List[Dict]:
+    """
+    Parse a single DDF XML and return records for its Exec-capable nodes.
+
+    Module-level (not a closure) so ProcessPoolExecutor can pickle it;
+    `item` is (member name, raw XML bytes).
+    """
+    name, xml_bytes = item
+    filename = name.split("/")[-1]
+
+    # Open <Node> elements, outermost first. Each entry is
+    # [elem, preorder_index, resolved] where resolved stays None until the
+    # node's URI/DFProperties chain are first needed — at a Node's *start*
+    # event its NodeName has not been parsed yet, so resolution is lazy and
+    # happens at the first *end* event that needs it. The DDF schema puts
+    # NodeName/Path/DFProperties before child <Node>s, so by the time any
+    # descendant ends, every ancestor's scalar children are available.
+    node_stack: List[list] = []
+    tree_depth = 0  # <MgmtTree> nesting; Nodes outside one are ignored
+    order = 0       # pre-order counter, assigned at start events
+    records: List[Tuple[int, Dict]] = []
+    desc_cache: Dict = {}  # DFProperties elem -> normalized Description
+
+    def resolve(idx: int) -> Tuple[str, List[ET.Element], Dict[str, ET.Element]]:
+        """(uri, dfprops_chain, child map) for node_stack[idx], memoized."""
+        entry = node_stack[idx]
+        if entry[2] is None:
+            if idx > 0:
+                parent_uri, parent_chain, _ = resolve(idx - 1)
+            else:
+                parent_uri, parent_chain = "", []
+            # One pass over the children instead of a scan per lookup.
+            kids = child_map(entry[0])
+            node_name = elem_text(kids.get("nodename")) or ""
+            path_prefix = elem_text(kids.get("path")) or parent_uri
+            uri = join_uri(path_prefix, node_name)
+            dfprops = kids.get("dfproperties")
+            # Chain: current DFProps (if any) at the front, then ancestors'
+            chain = [dfprops] + parent_chain if dfprops is not None else parent_chain
+            entry[2] = (uri, chain, kids)
+        return entry[2]
+
+    # Local alias: the event loop runs once per element, and a local binding
+    # is cheaper to load in CPython than a module global.
+    _lname = lname
+
+    try:
+        for event, elem in _iterparse(io.BytesIO(xml_bytes)):
+            ln = _lname(elem.tag)
+            if event == "start":
+                if ln == "node":
+                    if tree_depth:
+                        node_stack.append([elem, order, None])
+                        order += 1
+                elif ln == "mgmttree":
+                    tree_depth += 1
+                continue
+
+            # end events
+            if ln == "node":
+                if not (node_stack and node_stack[-1][0] is elem):
+                    # <Node> outside any <MgmtTree>: never inspected, but
+                    # still worth freeing so stray documents in the bundle
+                    # don't accumulate their whole tree in memory.
+                    elem.clear()
+                    continue
+                this_uri, cur_chain, kids = resolve(len(node_stack) - 1)
+                _, preorder, _ = node_stack.pop()
+
+                # Effective DFProps for format/default/access decisions =
+                # current if any, else closest ancestor's (= head of chain)
+                eff_dfprops = cur_chain[0] if cur_chain else None
+                if this_uri and eff_dfprops is not None:
+                    has_exec, fmt, default_val = dfprops_info(eff_dfprops)
+                    if has_exec:
+                        # Inherit Description and OsBuildVersion up the chain if missing
+                        desc = inherited_text_from_chain(cur_chain, "Description", desc_cache)
+                        min_os = inherited_osbuild_from_chain(cur_chain)
+
+                        records.append((preorder, {
+                            "Source": filename,
+                            "CommandName": elem_text(kids.get("nodename")) or "",
+                            "OMA_URI": this_uri,
+                            "MinOSVersion": min_os,
+                            "Description": desc,
+                            "DeclaredFormat": fmt,
+                            "DefaultValue": default_val,
+                        }))
+
+                # Subtree fully processed; free it so memory stays bounded
+                # by the current root-to-leaf path, not the whole document.
+                elem.clear()
+            elif ln == "mgmttree":
+                tree_depth -= 1
+                # Every Node inside has been processed and cleared already;
+                # drop the remaining shell (and any non-Node siblings).
+                elem.clear()
+    except Exception:
+        return []
+
+    # Ends arrive deepest-first; restore document pre-order so first-wins
+    # dedup picks the same record the old whole-tree walk did.
+    records.sort(key=lambda r: r[0])
+    seen: Dict[str, Dict] = {}
+    for _, rec in records:
+        seen.setdefault(rec["OMA_URI"], rec)
+    return list(seen.values())
+
+def discover_exec_entries_from_zip(zip_file: BinaryIO) -> List[Dict]:
     """
-    Walk all XMLs in the DDF bundle, collect Exec-capable nodes and their details.
+    Walk all XMLs in the DDF bundle and return the final Exec command records
+    (rendered payload included), deduplicated by OMA_URI.
+    - `zip_file` is any seekable binary file object holding the ZIP.
+    - Files are parsed in parallel worker processes; the ZIP handle cannot
+      cross process boundaries, so members are read in the parent and the
+      raw bytes shipped to the workers.
     - DFProperties are inherited down the tree (including Description and Applicability).
     - We pass a DFProperties *chain* (list) instead of mutating XML nodes.
     """
-    out: List[Dict] = []
-
-    with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as zf:
+    with zipfile.ZipFile(zip_file, "r") as zf:
+        payloads: List[Tuple[str, bytes]] = []
         for name in zf.namelist():
             if not name.lower().endswith(".xml"):
                 continue
-
-            # Parse XML file
-            try:
-                with zf.open(name) as f:
-                    xml_bytes = f.read()
-                root = ET.fromstring(xml_bytes)
-            except Exception:
-                continue
-
-            def walk(node: ET.Element, inherited_path: str, filename: str, dfprops_chain: List[ET.Element]) -> None:
-                if lname(node.tag) != "node":
-                    return
-
-                node_name = first_child_text(node, "NodeName") or ""
-                path_prefix = first_child_text(node, "Path") or inherited_path
-                this_uri = join_uri(path_prefix, node_name)
-
-                node_dfprops = first_child(node, "DFProperties")
-                # New chain: put current DFProps (if any) at the front
-                if node_dfprops is not None:
-                    cur_chain = [node_dfprops] + dfprops_chain
-                else:
-                    cur_chain = dfprops_chain
-
-                # Effective DFProps for format/default/access decisions = current if any, else first of chain (parent)
-                eff_dfprops = node_dfprops or (cur_chain[0] if cur_chain else None)
-
-                if eff_dfprops is not None and has_exec_access(eff_dfprops):
-                    fmt = df_format(eff_dfprops)
-                    default_val = default_value(eff_dfprops)
-                    # Inherit Description and OsBuildVersion up the chain if missing
-                    desc = inherited_text_from_chain(cur_chain, "Description")
-                    min_os = inherited_osbuild_from_chain(cur_chain)
-
-                    out.append({
-                        "Source": filename.split("/")[-1],
-                        "CommandName": node_name,
-                        "OMA_URI": this_uri,
-                        "MinOSVersion": min_os,
-                        "Description": desc,
-                        "DeclaredFormat": fmt,
-                        "DefaultValue": default_val,
-                    })
-
-                # Recurse into children
-                for child in node:
-                    if lname(child.tag) == "node":
-                        walk(child, this_uri, filename, cur_chain)
-
-            # Find <MgmtTree> root
-            mgmt = root if lname(root.tag) == "mgmttree" else None
-            if mgmt is None:
-                for e in root.iter():
-                    if lname(e.tag) == "mgmttree":
-                        mgmt = e
-                        break
-            if mgmt is None:
-                continue
-
-            # Start walk for each top-level <Node>
-            for top in mgmt:
-                if lname(top.tag) == "node":
-                    top_dfprops = first_child(top, "DFProperties")
-                    top_chain: List[ET.Element] = [top_dfprops] if top_dfprops is not None else []
-                    walk(top, first_child_text(top, "Path") or "", name, top_chain)
-
-    return out
+            data = zf.read(name)
+            # Cheap substring prefilter: a file without "exec" anywhere
+            # cannot contain an <Exec/> access type, so skip the XML parse
+            # (and the trip to a worker) entirely. Lowercased to match the
+            # case-insensitive tag matching in the walk; false positives
+            # ("Exec" in description prose) just get parsed as before.
+            if b"exec" in data.lower():
+                payloads.append((name, data))
+
+    if not payloads:
+        return []
+
+    # Workers dedup within their own file; this dict dedups across files.
+    # map() preserves input order, so first-wins still follows namelist
+    # order. Records that survive dedup get their Exec payload rendered
+    # right here — one pass instead of a dedup loop plus a render loop.
+    seen: Dict[str, Dict] = {}
+    # Equal strings from different workers come back as distinct objects
+    # after unpickling. Short repeated values (source file, command name,
+    # OS build) get sys.intern'd; Descriptions — too large and numerous for
+    # the intern table — are folded through a local dict so inherited text
+    # shared by many commands is stored once.
+    shared_desc: Dict[str, str] = {}
+    with concurrent.futures.ProcessPoolExecutor() as pool:
+        for records in pool.map(_extract_from_xml, payloads, chunksize=8):
+            for e in records:
+                uri = e["OMA_URI"]
+                if uri not in seen:
+                    desc = e["Description"]
+                    min_os = e["MinOSVersion"]
+                    seen[uri] = {
+                        "Source": sys.intern(e["Source"]),
+                        "CommandName": sys.intern(e["CommandName"]),
+                        "OMA_URI": uri,
+                        "MinOSVersion": sys.intern(min_os) if min_os is not None else None,
+                        "Description": shared_desc.setdefault(desc, desc) if desc is not None else None,
+                        "Exec": build_exec_lines(uri, e["DeclaredFormat"], e["DefaultValue"]),
+                    }
+    return list(seen.values())
 
 # --------------------------------------------------------------------
 # Main
@@ -278,35 +555,19 @@ def discover_exec_entries_from_zip(zip_bytes: bytes) -> List[Dict]:
 def main() -> None:
     log("Locating latest DDF ZIP on Microsoft Learn…")
     zip_url = find_latest_ddf_zip_url()
-    log(f"Downloading: {zip_url}")
-    data = download(zip_url)
-
-    log("Parsing Exec-capable nodes (with inherited Description/MinOS)…")
-    raw_execs = discover_exec_entries_from_zip(data)
-
-    # Deduplicate by OMA_URI and sort for stable output
-    seen: Dict[str, Dict] = {}
-    for e in raw_execs:
-        uri = (e.get("OMA_URI") or "").strip()
-        if uri and uri not in seen:
-            seen[uri] = e
-    execs = sorted(seen.values(), key=lambda x: (x["Source"], x["OMA_URI"]))
-
-    # Finalize: render Exec payload and drop internal fields
-    out: List[Dict] = []
-    for e in execs:
-        lines = build_exec_lines(e["OMA_URI"], e.get("DeclaredFormat"), e.get("DefaultValue"))
-        out.append({
-            "Source": e["Source"],
-            "CommandName": e["CommandName"],
-            "OMA_URI": e["OMA_URI"],
-            "MinOSVersion": e.get("MinOSVersion"),
-            "Description": e.get("Description"),
-            "Exec": lines,
-        })
-
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(out, f, indent=2)
+    with fetch_ddf_zip(zip_url) as zip_file:
+        log("Parsing Exec-capable nodes (with inherited Description/MinOS)…")
+        out = discover_exec_entries_from_zip(zip_file)
+
+    # Already deduplicated and rendered; just sort for stable output
+    out.sort(key=lambda x: (x["Source"], x["OMA_URI"]))
+
+    if orjson is not None:
+        with open(OUTPUT_FILE, "wb") as f:
+            f.write(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=2)
 
     log(f"Done. Wrote {len(out)} Exec commands to {OUTPUT_FILE}")
 